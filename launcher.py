@@ -5,15 +5,18 @@ Easy launcher for the MCP Local Files Server
 """
 
 import os
+import shutil
 import sys
 import subprocess
 import argparse
+import functools
 import json
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=1)
 def find_python_executable():
-    """Find the best Python executable to use"""
+    """Find the best Python executable to use (probed once per run)"""
     # Check for virtual environment
     if 'VIRTUAL_ENV' in os.environ:
         venv_python = Path(os.environ['VIRTUAL_ENV']) / 'bin' / 'python'
@@ -33,6 +36,19 @@ def find_python_executable():
     raise RuntimeError("No Python executable found")
 
 
+def write_json_atomic(path, data):
+    """Write JSON to a temporary file, then swap it into place with os.replace"""
+    # Replace the real file behind a symlinked config, not the link itself
+    target = path.resolve()
+    tmp_path = target.with_suffix('.json.tmp')
+    # json.dump escapes non-ASCII, so the file reads back the same under any locale
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    if target.exists():
+        shutil.copymode(target, tmp_path)
+    os.replace(tmp_path, target)
+
+
 def create_vscode_config(project_path, server_path):
     """Create or update VSCode configuration"""
     vscode_dir = project_path / '.vscode'
@@ -44,7 +60,7 @@ def create_vscode_config(project_path, server_path):
     settings = {}
     if settings_file.exists():
         try:
-            with open(settings_file, 'r') as f:
+            with open(settings_file, 'r', encoding='utf-8') as f:
                 settings = json.load(f)
         except json.JSONDecodeError:
             print("Warning: Existing settings.json is invalid, creating new one")
@@ -76,8 +92,7 @@ def create_vscode_config(project_path, server_path):
     settings.update(mcp_config)
     
     # Write back to file
-    with open(settings_file, 'w') as f:
-        json.dump(settings, f, indent=2)
+    write_json_atomic(settings_file, settings)
     
     print(f"✓ Created/updated VSCode configuration: {settings_file}")
 
@@ -108,8 +123,7 @@ def create_global_mcp_config(server_path, project_path):
         }
     }
     
-    with open(config_file, 'w') as f:
-        json.dump(config, f, indent=2)
+    write_json_atomic(config_file, config)
     
     print(f"✓ Created global MCP configuration: {config_file}")
 
@@ -7,134 +7,368 @@ Provides GitHub Copilot with context from local files through VSCode
 import asyncio
 import json
 import logging
+import operator
 import os
+import re
+import stat
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import (Any, ClassVar, Dict, FrozenSet, Iterable, Iterator, List, Optional,
+                    Pattern, Sequence, Tuple)
 import argparse
 import fnmatch
-import mimetypes
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+# Setup logging once per process, leaving any existing configuration alone
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            RotatingFileHandler('mcp_server.log', maxBytes=5 * 1024 * 1024,
+                                backupCount=3, delay=True),
+            logging.StreamHandler()
+        ]
+    )
+
+# Optional: faster JSON encoding/decoding for large resource lists
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _encode_message(message: Dict[str, Any]) -> bytes:
+    """Serialize a JSON-RPC message to a newline-terminated UTF-8 line"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(message) + b'\n'
+        except TypeError:
+            # orjson.JSONEncodeError (a TypeError) rejects lone surrogates, which
+            # is how Python represents non-UTF-8 filenames; json escapes them
+            pass
+    return json.dumps(message).encode('utf-8') + b'\n'
+
+
+def _decode_message(line: bytes) -> Any:
+    """Parse one JSON-RPC line; raises json.JSONDecodeError on bad input"""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+# Directories pruned during traversal, matched by exact name
+IGNORED_DIR_NAMES = frozenset({
+    '__pycache__', '.git', 'node_modules', '.vscode', '.idea', 'venv'
+})
+
+# Glob patterns applied to file names only
+IGNORED_FILE_GLOBS = (
+    '*.pyc', '.gitignore', '*.log', '*.tmp', '.DS_Store',
+    '.env', '*.so', '*.dll', '*.exe', '*.bin', '*.zip', '*.tar.gz',
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp', '*.ico', '*.svg',
+    '*.mp3', '*.mp4', '*.avi', '*.mov', '*.wav', '*.pdf'
+)
+
+# All file globs combined into one regex so each name is matched once.
+# fnmatch.fnmatch is case-insensitive on Windows, so keep that behaviour.
+IGNORED_FILE_RE = re.compile(
+    '|'.join(f'(?:{fnmatch.translate(p)})' for p in IGNORED_FILE_GLOBS),
+    re.IGNORECASE if os.name == 'nt' else 0
+)
+
+ALLOWED_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.scss',
+    '.json', '.xml', '.yaml', '.yml', '.md', '.txt', '.ini', '.cfg',
+    '.conf', '.sh', '.bat', '.ps1', '.sql', '.r', '.cpp', '.c',
+    '.h', '.hpp', '.java', '.go', '.rs', '.php', '.rb', '.swift',
+    '.kt', '.scala', '.clj', '.hs', '.elm', '.dart', '.vue',
+    '.svelte', '.astro', '.dockerfile', '.makefile', '.toml',
+    # Other common text formats
+    '.htm', '.shtml', '.csv', '.tsv', '.rst', '.markdown', '.text', '.tex',
+    '.bib', '.diff', '.patch', '.pl', '.pm', '.tcl', '.ksh', '.csh',
+    '.cc', '.cxx', '.hh', '.hxx', '.mjs', '.ics', '.vcf', '.srt', '.vtt'
+})
+
+
+class _ScanBudget:
+    """File budget shared by the threads walking the top-level subtrees.
+
+    Results are merged in slot order, so slot ``i`` only contributes what is
+    left of ``limit`` after slots ``0..i-1``. A slot can therefore stop once
+    its own count plus the counts found so far by earlier slots reaches the
+    limit. Counts only grow, so no slot stops short of what the ordered merge
+    takes from it, and the result doesn't depend on thread timing. Each slot
+    is only incremented by the one thread walking it.
+    """
+
+    def __init__(self, limit: int, slots: int):
+        self.limit = limit
+        self.counts = [0] * slots
+
+    def exhausted(self, slot: int) -> bool:
+        return sum(self.counts[:slot + 1]) >= self.limit
+
+    def take(self, slot: int):
+        self.counts[slot] += 1
+
 
 # MCP Protocol Implementation
 class MCPServer:
-    def __init__(self, root_path: str = None, max_file_size: int = 1024 * 1024):
-        self.root_path = Path(root_path) if root_path else Path.cwd()
+    ignored_dir_names: ClassVar[FrozenSet[str]] = IGNORED_DIR_NAMES
+    ignored_file_globs: ClassVar[Tuple[str, ...]] = IGNORED_FILE_GLOBS
+    ignored_file_re: ClassVar[Pattern[str]] = IGNORED_FILE_RE
+    allowed_extensions: ClassVar[FrozenSet[str]] = ALLOWED_EXTENSIONS
+
+    def __init__(self, root_path: str = None, max_file_size: int = 1024 * 1024,
+                 scan_cache_ttl: float = 5.0, content_cache_bytes: int = 32 * 1024 * 1024):
+        # Fully resolved so resources/read can compare against realpath'd URIs
+        self.root_path = Path(os.path.realpath(root_path or os.getcwd()))
+        # Traversal works on plain strings; relative paths are sliced off
+        # absolute ones using this prefix instead of Path.relative_to
+        self.root_str = str(self.root_path)
+        self._root_prefix = os.path.join(self.root_str, '')
         self.max_file_size = max_file_size
-        self.ignored_patterns = [
-            '*.pyc', '__pycache__', '.git', '.gitignore', 'node_modules',
-            '.vscode', '.idea', '*.log', '*.tmp', '.DS_Store', 'venv',
-            '.env', '*.so', '*.dll', '*.exe', '*.bin', '*.zip', '*.tar.gz',
-            '*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp', '*.ico', '*.svg',
-            '*.mp3', '*.mp4', '*.avi', '*.mov', '*.wav', '*.pdf'
-        ]
-        self.allowed_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', '.scss',
-            '.json', '.xml', '.yaml', '.yml', '.md', '.txt', '.ini', '.cfg',
-            '.conf', '.sh', '.bat', '.ps1', '.sql', '.r', '.cpp', '.c',
-            '.h', '.hpp', '.java', '.go', '.rs', '.php', '.rb', '.swift',
-            '.kt', '.scala', '.clj', '.hs', '.elm', '.dart', '.vue',
-            '.svelte', '.astro', '.dockerfile', '.makefile', '.toml'
-        }
-        
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('mcp_server.log'),
-                logging.StreamHandler()
-            ]
-        )
+        # Results of the last scan_directory call, reused for scan_cache_ttl
+        # seconds as long as max_files and the root mtime are unchanged
+        self.scan_cache_ttl = scan_cache_ttl
+        self._scan_cache = None
+        self._scan_cache_key = None
+        self._scan_cache_time = 0.0
+        # scan_directory runs in executor threads, so guard the cache fields
+        self._scan_cache_lock = threading.Lock()
+        # Decoded file contents keyed by (path, mtime_ns, size) in LRU order,
+        # bounded by the memory the cached strings occupy (sys.getsizeof, so
+        # non-ASCII text is charged at its real 2 or 4 bytes per character).
+        # Reads run in executor threads, so access goes through a lock.
+        self.content_cache_bytes = content_cache_bytes
+        self._content_cache = OrderedDict()
+        self._content_cache_size = 0
+        self._content_cache_lock = threading.Lock()
+        # Serialises stdout writes; created in run_stdio inside the event loop
+        self._write_lock = None
         self.logger = logging.getLogger(__name__)
 
-    def should_ignore_file(self, file_path: Path) -> bool:
-        """Check if file should be ignored based on patterns"""
-        file_str = str(file_path)
-        for pattern in self.ignored_patterns:
-            if fnmatch.fnmatch(file_str, pattern) or fnmatch.fnmatch(file_path.name, pattern):
-                return True
-        return False
+    def should_ignore_file(self, entry) -> bool:
+        """Check if a file entry should be ignored based on its name"""
+        return self.ignored_file_re.match(entry.name) is not None
 
-    def is_text_file(self, file_path: Path) -> bool:
+    def is_text_file(self, entry) -> bool:
         """Check if file is a text file we can read"""
-        if file_path.suffix.lower() in self.allowed_extensions:
-            return True
-        
-        # Use mimetypes to check
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type and mime_type.startswith('text/'):
-            return True
-            
-        return False
+        return os.path.splitext(entry.name)[1].lower() in self.allowed_extensions
+
+    def read_file_content(self, file_path, stat_result: os.stat_result) -> Optional[str]:
+        """Read file content safely, given its stat result from an earlier call.
 
-    def read_file_content(self, file_path: Path) -> Optional[str]:
-        """Read file content safely"""
+        Decoded content is cached by (path, mtime, size), so edits to the
+        file invalidate its entry automatically.
+        """
         try:
-            if file_path.stat().st_size > self.max_file_size:
-                return f"[File too large: {file_path.stat().st_size} bytes]"
+            size = stat_result.st_size
+            if size > self.max_file_size:
+                return f"[File too large: {size} bytes]"
             
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
+            cache_key = (os.fspath(file_path), stat_result.st_mtime_ns, size)
+            with self._content_cache_lock:
+                cached = self._content_cache.get(cache_key)
+                if cached is not None:
+                    self._content_cache.move_to_end(cache_key)
+                    return cached[0]
+            
+            # Raw reads into a bytes buffer, decoded once. os.read may return
+            # short counts (FUSE, NFS, signals), so keep reading to size or EOF.
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                data = os.read(fd, size)
+                while len(data) < size:
+                    chunk = os.read(fd, size - len(data))
+                    if not chunk:
+                        break
+                    data += chunk
+            finally:
+                os.close(fd)
+            content = data.decode('utf-8', errors='ignore')
+            
+            cost = sys.getsizeof(content)
+            if content and cost <= self.content_cache_bytes:
+                with self._content_cache_lock:
+                    if cache_key not in self._content_cache:
+                        self._content_cache[cache_key] = (content, cost)
+                        self._content_cache_size += cost
+                    # Evict least recently read files until back under budget
+                    while self._content_cache_size > self.content_cache_bytes:
+                        _, (_, evicted_cost) = self._content_cache.popitem(last=False)
+                        self._content_cache_size -= evicted_cost
+            return content
         except Exception as e:
-            self.logger.error(f"Error reading file {file_path}: {e}")
+            self.logger.error("Error reading file %s: %s", file_path, e)
             return f"[Error reading file: {e}]"
 
-    def get_file_info(self, file_path: Path) -> Dict[str, Any]:
-        """Get file information"""
+    def get_file_info(self, entry,
+                      stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """Get file information from a DirEntry or Path under the root.
+
+        Pass ``stat_result`` when the caller has already stat'ed the file;
+        otherwise ``entry.stat()`` is called once (cached for a DirEntry).
+        """
         try:
-            stat = file_path.stat()
+            if stat_result is None:
+                stat_result = entry.stat()
+            path = os.fspath(entry)
             return {
-                'path': str(file_path.relative_to(self.root_path)),
-                'absolute_path': str(file_path),
-                'size': stat.st_size,
-                'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                'extension': file_path.suffix,
-                'is_text': self.is_text_file(file_path)
+                'path': path[len(self._root_prefix):],
+                'absolute_path': path,
+                'size': stat_result.st_size,
+                'modified': datetime.fromtimestamp(stat_result.st_mtime).isoformat(),
+                'extension': os.path.splitext(entry.name)[1],
+                'is_text': self.is_text_file(entry)
             }
         except Exception as e:
-            self.logger.error(f"Error getting file info for {file_path}: {e}")
+            self.logger.error("Error getting file info for %s: %s", entry, e)
             return None
 
+    def _list_directory(self, path) -> Tuple[List[os.DirEntry], List[str]]:
+        """Split one directory into file entries and the subdirectories to descend.
+
+        Symlinks are skipped and ignored directories are pruned so their
+        subtrees are never descended. Unreadable directories are logged and
+        treated as empty.
+        """
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self.ignored_dir_names:
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append(entry)
+        except OSError as e:
+            self.logger.error("Error listing directory %s: %s", path, e)
+        return files, subdirs
+
+    def _scandir_recursive(self, path, budget: '_ScanBudget',
+                           slot: int) -> Iterator[os.DirEntry]:
+        """Walk a directory tree with os.scandir, yielding DirEntry objects for files.
+
+        Stops descending once ``budget`` has no room left for ``slot``.
+        """
+        files, subdirs = self._list_directory(path)
+        yield from files
+        for subdir in subdirs:
+            if budget.exhausted(slot):
+                return
+            yield from self._scandir_recursive(subdir, budget, slot)
+
+    def _collect_files(self, entries: Iterable[os.DirEntry], budget: '_ScanBudget',
+                       slot: int) -> List[Dict[str, Any]]:
+        """Build file info for the readable, non-ignored entries of one budget slot"""
+        files = []
+        for entry in entries:
+            if budget.exhausted(slot):
+                break
+                
+            if not self.should_ignore_file(entry) and self.is_text_file(entry):
+                file_info = self.get_file_info(entry)
+                if file_info:
+                    budget.take(slot)
+                    files.append(file_info)
+        return files
+
     def scan_directory(self, max_files: int = 1000) -> List[Dict[str, Any]]:
-        """Scan directory for relevant files"""
+        """Scan directory for relevant files, reusing a recent result if still valid"""
+        try:
+            cache_key = (max_files, os.stat(self.root_str).st_mtime_ns)
+        except OSError:
+            cache_key = None
+        
+        with self._scan_cache_lock:
+            if (self._scan_cache is not None and cache_key is not None
+                    and cache_key == self._scan_cache_key
+                    and time.monotonic() - self._scan_cache_time < self.scan_cache_ttl):
+                return list(self._scan_cache)
+        
         files = []
         try:
-            for file_path in self.root_path.rglob('*'):
-                if len(files) >= max_files:
-                    break
-                    
-                if file_path.is_file() and not self.should_ignore_file(file_path):
-                    if self.is_text_file(file_path):
-                        file_info = self.get_file_info(file_path)
-                        if file_info:
-                            files.append(file_info)
+            top_files, subdirs = self._list_directory(self.root_str)
+            # Slot 0 is the root's own files, slot i + 1 is subdirs[i]
+            budget = _ScanBudget(max_files, len(subdirs) + 1)
+            files = self._collect_files(top_files, budget, 0)
+            
+            # Walk each top-level subdirectory in its own thread; scandir and
+            # stat release the GIL so independent subtrees overlap their I/O
+            if subdirs and not budget.exhausted(0):
+                max_workers = min(32, (os.cpu_count() or 1) * 4, len(subdirs))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(self._collect_files,
+                                        self._scandir_recursive(subdir, budget, slot),
+                                        budget, slot)
+                        for slot, subdir in enumerate(subdirs, start=1)
+                    ]
+                    # Merge in directory order so results are stable between scans
+                    for future in futures:
+                        files.extend(future.result())
+            del files[max_files:]
         except Exception as e:
-            self.logger.error(f"Error scanning directory: {e}")
+            self.logger.error("Error scanning directory: %s", e)
+            return files
         
-        return files
+        with self._scan_cache_lock:
+            self._scan_cache = files
+            self._scan_cache_key = cache_key
+            self._scan_cache_time = time.monotonic()
+        return list(files)
 
     def get_file_content(self, relative_path: str) -> Optional[Dict[str, Any]]:
         """Get content of a specific file"""
         try:
             file_path = self.root_path / relative_path
-            if not file_path.exists() or not file_path.is_file():
-                return None
             
+            # Reject the file itself or anything under a pruned directory
+            relative = Path(relative_path)
+            if any(part.name in self.ignored_dir_names for part in relative.parents):
+                return None
             if self.should_ignore_file(file_path) or not self.is_text_file(file_path):
                 return None
             
-            content = self.read_file_content(file_path)
-            file_info = self.get_file_info(file_path)
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                return None
+            if not stat.S_ISREG(stat_result.st_mode):
+                return None
+            
+            file_info = self.get_file_info(file_path, stat_result)
+            if not file_info:
+                return None
+            content = self.read_file_content(file_path, stat_result)
             
-            if file_info and content is not None:
+            if content is not None:
                 file_info['content'] = content
                 return file_info
         except Exception as e:
-            self.logger.error(f"Error getting file content for {relative_path}: {e}")
+            self.logger.error("Error getting file content for %s: %s", relative_path, e)
         
         return None
 
+    def get_uri_content(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Get content of a file given its absolute path, if it lies under the root"""
+        # Resolve '..' and symlinks first so the prefix check cannot be escaped
+        file_path = os.path.realpath(file_path)
+        if not file_path.startswith(self._root_prefix):
+            return None
+        return self.get_file_content(file_path[len(self._root_prefix):])
+
     async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle MCP request"""
         try:
@@ -163,16 +397,20 @@ class MCPServer:
                 }
 
             elif method == 'resources/list':
-                files = self.scan_directory()
-                resources = []
-                
-                for file_info in files:
-                    resources.append({
-                        'uri': f"file://{file_info['absolute_path']}",
-                        'name': file_info['path'],
-                        'description': f"Local file: {file_info['path']} ({file_info['size']} bytes)",
+                # Blocking filesystem work runs in the default executor so the
+                # event loop keeps serving other requests meanwhile
+                loop = asyncio.get_running_loop()
+                files = await loop.run_in_executor(None, self.scan_directory)
+                fields = operator.itemgetter('absolute_path', 'path', 'size')
+                resources = [
+                    {
+                        'uri': f"file://{absolute_path}",
+                        'name': path,
+                        'description': f"Local file: {path} ({size} bytes)",
                         'mimeType': 'text/plain'
-                    })
+                    }
+                    for absolute_path, path, size in map(fields, files)
+                ]
                 
                 return {
                     'id': request_id,
@@ -184,9 +422,10 @@ class MCPServer:
             elif method == 'resources/read':
                 uri = params.get('uri', '')
                 if uri.startswith('file://'):
-                    file_path = uri[7:]  # Remove 'file://' prefix
-                    relative_path = Path(file_path).relative_to(self.root_path)
-                    file_data = self.get_file_content(str(relative_path))
+                    loop = asyncio.get_running_loop()
+                    file_data = await loop.run_in_executor(
+                        None, self.get_uri_content, uri[7:]  # Remove 'file://' prefix
+                    )
                     
                     if file_data:
                         return {
@@ -218,7 +457,7 @@ class MCPServer:
                 }
 
         except Exception as e:
-            self.logger.error(f"Error handling request: {e}")
+            self.logger.error("Error handling request: %s", e)
             return {
                 'id': request.get('id'),
                 'error': {
@@ -227,35 +466,152 @@ class MCPServer:
                 }
             }
 
-    async def run_stdio(self):
+    @staticmethod
+    def _is_pipe(stream) -> bool:
+        """Check if a stdio stream is a pipe or socket.
+
+        The asyncio pipe transports also accept ttys, but they switch the fd
+        to non-blocking mode and never restore it, which would leave the
+        user's terminal (shared with stderr logging) non-blocking.
+        """
+        try:
+            mode = os.fstat(stream.fileno()).st_mode
+        except (AttributeError, ValueError, OSError):
+            return False
+        return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
+    @staticmethod
+    def _shares_file(stream, *others) -> bool:
+        """Check if a stdio stream is the same open file as any of ``others``.
+
+        O_NONBLOCK is a property of the file, so attaching a transport to one
+        of them (e.g. stdout with ``2>&1``) would make the others, including
+        stderr logging, non-blocking too.
+        """
+        try:
+            st = os.fstat(stream.fileno())
+        except (AttributeError, ValueError, OSError):
+            return False
+        for other in others:
+            try:
+                other_st = os.fstat(other.fileno())
+            except (AttributeError, ValueError, OSError):
+                continue
+            if (st.st_dev, st.st_ino) == (other_st.st_dev, other_st.st_ino):
+                return True
+        return False
+
+    async def _open_stdin_reader(self) -> Optional[asyncio.StreamReader]:
+        """Attach stdin to the event loop, or return None if it is not a pipe"""
+        if not self._is_pipe(sys.stdin) or self._shares_file(sys.stdin, sys.stdout, sys.stderr):
+            return None
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=64 * 1024 * 1024)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        try:
+            await loop.connect_read_pipe(lambda: protocol, sys.stdin)
+        except (NotImplementedError, ValueError, OSError) as e:
+            self.logger.info("Falling back to blocking stdin reads: %s", e)
+            return None
+        return reader
+
+    async def _open_stdout_writer(self) -> Optional[asyncio.StreamWriter]:
+        """Attach stdout to the event loop, or return None if it is not a pipe"""
+        if not self._is_pipe(sys.stdout) or self._shares_file(sys.stdout, sys.stdin, sys.stderr):
+            return None
+        loop = asyncio.get_running_loop()
+        try:
+            transport, protocol = await loop.connect_write_pipe(
+                asyncio.streams.FlowControlMixin, sys.stdout
+            )
+        except (NotImplementedError, ValueError, OSError) as e:
+            self.logger.info("Falling back to blocking stdout writes: %s", e)
+            return None
+        return asyncio.StreamWriter(transport, protocol, None, loop)
+
+    async def _send_response(self, writer: Optional[asyncio.StreamWriter],
+                             response: Dict[str, Any]):
+        """Write one JSON-RPC response line to stdout"""
+        await self._write_line(writer, _encode_message(response))
+
+    async def _write_line(self, writer: Optional[asyncio.StreamWriter], data: bytes):
+        """Write one already-encoded line to stdout"""
+        # Concurrent requests finish in any order; keep each line intact
+        async with self._write_lock:
+            if writer is not None:
+                writer.write(data)
+                await writer.drain()
+            else:
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
+
+    async def _process_request(self, request: Dict[str, Any],
+                               writer: Optional[asyncio.StreamWriter],
+                               semaphore: asyncio.Semaphore):
+        """Handle one request and send its response, releasing its concurrency slot"""
+        try:
+            response = await self.handle_request(request)
+            await self._send_response(writer, response)
+        except Exception as e:
+            self.logger.error("Error sending response: %s", e)
+            # Still answer the request so the client isn't left waiting; the
+            # reply is built with stdlib json, which can encode any id/message
+            error = {
+                'id': request.get('id') if isinstance(request, dict) else None,
+                'error': {
+                    'code': -32603,
+                    'message': f"Internal error: {str(e)}"
+                }
+            }
+            try:
+                await self._write_line(writer, json.dumps(error).encode('utf-8') + b'\n')
+            except Exception as e:
+                self.logger.error("Error sending error response: %s", e)
+        finally:
+            semaphore.release()
+
+    async def run_stdio(self, max_concurrent_requests: int = 16):
         """Run MCP server using stdio transport"""
-        self.logger.info(f"Starting MCP server for directory: {self.root_path}")
+        self.logger.info("Starting MCP server for directory: %s", self.root_path)
+        
+        loop = asyncio.get_running_loop()
+        reader = await self._open_stdin_reader()
+        writer = await self._open_stdout_writer()
+        self._write_lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+        pending = set()
         
         try:
             while True:
                 # Read JSON-RPC message from stdin
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, sys.stdin.readline
-                )
+                if reader is not None:
+                    line = await reader.readline()
+                else:
+                    line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
                 
                 if not line:
                     break
                 
                 try:
-                    request = json.loads(line.strip())
-                    response = await self.handle_request(request)
-                    
-                    # Write response to stdout
-                    print(json.dumps(response), flush=True)
-                    
+                    request = _decode_message(line.strip())
                 except json.JSONDecodeError as e:
-                    self.logger.error(f"Invalid JSON received: {e}")
+                    self.logger.error("Invalid JSON received: %s", e)
                     continue
+                
+                # Handle requests concurrently so a slow one doesn't block the rest
+                await semaphore.acquire()
+                task = asyncio.create_task(self._process_request(request, writer, semaphore))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            
+            # Flush responses for requests still in flight at EOF
+            if pending:
+                await asyncio.gather(*pending)
                     
         except KeyboardInterrupt:
             self.logger.info("Server stopped by user")
         except Exception as e:
-            self.logger.error(f"Server error: {e}")
+            self.logger.error("Server error: %s", e)
 
 
 def main():
@@ -264,10 +620,16 @@ def main():
                         help='Root directory to serve files from (default: current directory)')
     parser.add_argument('--max-file-size', type=int, default=1024*1024,
                         help='Maximum file size to read in bytes (default: 1MB)')
+    parser.add_argument('--scan-cache-ttl', type=float, default=5.0,
+                        help='Seconds to reuse a directory scan between requests (default: 5)')
+    parser.add_argument('--content-cache-bytes', type=int, default=32*1024*1024,
+                        help='Memory used by decoded file contents cached for repeat reads (default: 32MB)')
     
     args = parser.parse_args()
     
-    server = MCPServer(root_path=args.root, max_file_size=args.max_file_size)
+    server = MCPServer(root_path=args.root, max_file_size=args.max_file_size,
+                       scan_cache_ttl=args.scan_cache_ttl,
+                       content_cache_bytes=args.content_cache_bytes)
     
     try:
         asyncio.run(server.run_stdio())